@@ -12,24 +12,202 @@ Configurações são carregadas de arquivo externo para maior segurança.
 import os
 import sys
 import json
+import re
+import pickle
+import shutil
 import subprocess
+import tempfile
+import signal
 import tarfile
 import asyncio
 import venv
 import hashlib
-import tempfile
+import random
 import logging
 import argparse
+import contextlib
+import functools
+import importlib.util
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# orjson é opcional: acelera a leitura da configuração e dos manifestos
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tamanho do bloco de leitura usado no cálculo de hashes (1 MiB)
+CHUNK_SIZE = 1 << 20
+
+# Janela (segundos) para agrupar mensagens do Telegram e limite de caracteres
+JANELA_MENSAGENS = 0.25
+TELEGRAM_MAX_CHARS = 4096
+
+# Threads usadas no cálculo de hashes (hashlib e read() liberam o GIL)
+MAX_WORKERS_HASH = min(32, (os.cpu_count() or 1) * 4)
+
+# Arquivo encontrado na varredura de uma pasta (size é None se o stat falhar;
+# is_file é falso para FIFOs, sockets e dispositivos, que não podem ser lidos)
+ScanEntry = namedtuple('ScanEntry', ['relpath', 'size', 'mtime_ns', 'abspath', 'is_file'])
+
+# Diretórios de sistema ignorados no plano do dry-run
+_SKIP_DIRS = frozenset({'$RECYCLE.BIN', '.Trash-1000', 'System Volume Information'})
+
+
+def _novo_hash():
+    """Cria o objeto de hash usado nas comparações de conteúdo.
+
+    BLAKE2b com digest de 16 bytes mantém o mesmo tamanho do MD5 e é bem
+    mais rápido; o hash é usado apenas para igualdade, não como assinatura.
+    """
+    return hashlib.blake2b(digest_size=16)
+
+
+def _digest_arquivo(f):
+    """Calcula o digest do arquivo aberto em modo binário.
+
+    No Python 3.11+ o laço de leitura roda em C via hashlib.file_digest;
+    em versões anteriores o arquivo é lido em blocos de CHUNK_SIZE para um
+    buffer pré-alocado.
+    """
+    # Indica leitura sequencial ao kernel para ampliar o readahead
+    # (membros de um tar não têm descritor próprio)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (OSError, AttributeError):
+            pass
+    if sys.version_info >= (3, 11):
+        return hashlib.file_digest(f, _novo_hash).digest()
+    
+    # Buffer único reaproveitado com readinto, sem alocar bytes a cada bloco
+    hash_obj = _novo_hash()
+    buf = bytearray(CHUNK_SIZE)
+    mv = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        hash_obj.update(mv[:n])
+    return hash_obj.digest()
+
+
+# Fim de linha na saída do script: \n, \r\n ou \r (progresso do rclone), como no modo texto
+_FIM_DE_LINHA = re.compile(rb'\r\n|\r|\n')
+
+
+async def _linhas_saida(stream):
+    """Lê a saída de um subprocesso em blocos e produz as linhas como bytes.
+
+    Linhas maiores que CHUNK_SIZE são entregues em partes, em vez de estourar
+    o limite do StreamReader.
+    """
+    pendente = b''
+    while True:
+        bloco = await stream.read(CHUNK_SIZE)
+        if not bloco:
+            break
+        dados = pendente + bloco
+        # Um \r no fim do bloco pode ser metade de um \r\n
+        resto = b''
+        if dados.endswith(b'\r'):
+            dados, resto = dados[:-1], b'\r'
+        linhas = _FIM_DE_LINHA.split(dados)
+        pendente = linhas.pop() + resto
+        for linha in linhas:
+            yield linha
+        if len(pendente) > CHUNK_SIZE:
+            yield pendente
+            pendente = b''
+    if pendente:
+        yield pendente
+
+
+def _diff_ordenado(originais, extraidos):
+    """Compara duas sequências ordenadas de caminhos como um merge.
+
+    Retorna (faltando, extras) sem montar conjuntos com todos os caminhos.
+    """
+    faltando = []
+    extras = []
+    it_a = iter(originais)
+    it_b = iter(extraidos)
+    a = next(it_a, None)
+    b = next(it_b, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a < b):
+            faltando.append(a)
+            a = next(it_a, None)
+        elif a is None or a > b:
+            extras.append(b)
+            b = next(it_b, None)
+        else:
+            a = next(it_a, None)
+            # Entradas repetidas no tar contam como um único arquivo
+            atual = b
+            while b == atual:
+                b = next(it_b, None)
+    return faltando, extras
+
+
+def _iter_files(root):
+    """Percorre a árvore com os.scandir, retornando o DirEntry de cada arquivo.
+
+    O tipo e o stat ficam em cache no DirEntry, evitando um stat() extra por
+    arquivo em relação a os.walk + os.path.getsize.
+    """
+    pilha = [root]
+    while pilha:
+        try:
+            it = os.scandir(pilha.pop())
+        except OSError:
+            # Mesmo comportamento do os.walk: diretórios inacessíveis são ignorados
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pilha.append(entry.path)
+                elif not entry.is_dir():
+                    # Links para diretórios não são seguidos nem listados, como no os.walk
+                    yield entry
+
+
+def _json_loads(dados):
+    """Decodifica JSON (bytes) com orjson quando instalado, senão com o json padrão."""
+    if orjson is not None:
+        return orjson.loads(dados)
+    return json.loads(dados)
+
+
+def _json_dumps(obj):
+    """Codifica obj em JSON (bytes UTF-8) com orjson quando instalado."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=4096)
+def _contar_arquivos(root):
+    """Conta os arquivos sob root; memoizado para o plano do dry-run."""
+    return sum(1 for _ in _iter_files(root))
+
 
 class BackupManager:
     def __init__(self, config_file="config.json"):
         self.config_file = config_file
         self.config = self.load_config()
-        self.setup_logging()
+        # Seções da configuração consultadas com frequência
+        self._validation = self.config.get('validation', {})
+        self._s3 = self.config['s3']
+        self._backup_cfg = self.config['backup']
         self.logger = logging.getLogger(__name__)
+        self.setup_logging()
+        self._bot = None
+        self._fila_mensagens = None
+        self._scan_cache = {}
         
     def load_config(self):
         """Carrega configurações do arquivo JSON."""
@@ -43,14 +221,48 @@ class BackupManager:
             sys.exit(1)
             
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            self.validate_config(config)
+            # Configuração já validada fica em cache, invalidado por mtime e tamanho
+            # do JSON e pelo mtime deste script (regras de validação podem mudar)
+            stat = config_path.stat()
+            chave = (stat.st_mtime_ns, stat.st_size, os.stat(__file__).st_mtime_ns)
+            cache_path = config_path.with_suffix('.cache.pkl')
+            
+            config = self._ler_cache_config(cache_path, chave)
+            if config is None:
+                config = _json_loads(config_path.read_bytes())
+                self.validate_config(config)
+                self._gravar_cache_config(cache_path, chave, config)
             return config
         except Exception as e:
             print(f"❌ Erro ao carregar configuração: {e}")
             sys.exit(1)
     
+    def _ler_cache_config(self, cache_path, chave):
+        """Retorna a configuração em cache se ainda corresponder ao arquivo JSON."""
+        try:
+            with open(cache_path, 'rb') as f:
+                chave_cache, config = pickle.load(f)
+        except Exception:
+            return None
+        return config if chave_cache == chave else None
+    
+    def _gravar_cache_config(self, cache_path, chave, config):
+        """Grava o cache da configuração de forma atômica; falhas são ignoradas.
+
+        O cache contém o token do Telegram: mkstemp cria o arquivo com modo 0600
+        e com nome único, para execuções simultâneas não se sobrescreverem.
+        """
+        temporario = None
+        try:
+            fd, temporario = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((chave, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, cache_path)
+        except OSError:
+            if temporario is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(temporario)
+    
     def create_default_config(self, config_path):
         """Cria arquivo de configuração padrão."""
         default_config = {
@@ -60,12 +272,15 @@ class BackupManager:
             },
             "s3": {
                 "bucket": "SEU_BUCKET_S3_AQUI",
-                "storage_class": "DEEP_ARCHIVE"
+                "storage_class": "DEEP_ARCHIVE",
+                "parallel_uploads": 4
             },
             "backup": {
                 "script_path": "/mnt/storage/config/rotina-backup/backup.sh",
                 "temp_dir": "/tmp",
-                "max_size_gb": 1024
+                "max_size_gb": 1024,
+                "compression": "gzip",
+                "parallel_folders": 1
             },
             "folders": [
                 {
@@ -101,34 +316,34 @@ class BackupManager:
             
         if config['s3']['bucket'] == "SEU_BUCKET_S3_AQUI":
             raise ValueError("Configure o bucket S3 no arquivo config.json")
+        
+        if config['backup'].get('compression', 'gzip') not in ('gzip', 'zstd'):
+            raise ValueError("Compressão inválida: use 'gzip' ou 'zstd'")
+        
+        # Limites de paralelismo: inteiros maiores ou iguais a 1
+        for secao, chave in (('backup', 'parallel_folders'), ('s3', 'parallel_uploads')):
+            valor = config[secao].get(chave, 1)
+            if isinstance(valor, bool) or not isinstance(valor, int) or valor < 1:
+                raise ValueError(f"{chave} deve ser um inteiro maior ou igual a 1")
     
     def setup_logging(self):
         """Configura sistema de logging."""
         log_dir = Path(__file__).parent / "logs"
         log_dir.mkdir(exist_ok=True)
         
-        log_level = getattr(logging, self.config.get('logging', {}).get('level', 'INFO'))
         log_file = log_dir / f"backup_{datetime.now().strftime('%Y%m%d')}.log"
         
-        # Configuração de logging
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
-        
         # Se executando manualmente (não cron), usar nível DEBUG
         if sys.stdin.isatty():  # Terminal interativo
             log_level = logging.DEBUG
             print("🔍 Modo manual detectado - ativando logs detalhados")
-
+        else:
+            log_level = getattr(logging, self.config.get('logging', {}).get('level', 'INFO'))
+        
         # Configuração de logging
         logging.basicConfig(
             level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
                 logging.FileHandler(log_file, encoding='utf-8'),
                 logging.StreamHandler(sys.stdout)
@@ -142,12 +357,15 @@ class BackupManager:
         """Remove logs antigos baseado na configuração."""
         try:
             keep_days = self.config.get('logging', {}).get('keep_logs_days', 30)
-            cutoff = datetime.now() - timedelta(days=keep_days)
+            cutoff_ts = (datetime.now() - timedelta(days=keep_days)).timestamp()
             
-            for log_file in log_dir.glob("backup_*.log"):
-                if log_file.stat().st_mtime < cutoff.timestamp():
-                    log_file.unlink()
-                    self.logger.info(f"Log antigo removido: {log_file}")
+            with os.scandir(log_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith("backup_") and entry.name.endswith(".log")):
+                        continue
+                    if entry.stat().st_mtime < cutoff_ts:
+                        os.unlink(entry.path)
+                        self.logger.info(f"Log antigo removido: {entry.path}")
         except Exception as e:
             self.logger.warning(f"Erro ao limpar logs antigos: {e}")
 
@@ -159,16 +377,29 @@ class BackupManager:
         else:
             self.logger.debug(f'Ambiente virtual já existe em {venv_dir}.')
 
-    def install_module(self, module_name, python_executable):
-        """Install a module in the virtual environment."""
+    def modules_installed(self, import_names, python_executable):
+        """Check whether the modules can already be imported in the virtual environment."""
+        resultado = subprocess.run([python_executable, '-c', 'import ' + ', '.join(import_names)],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return resultado.returncode == 0
+
+    def install_modules(self, module_names, python_executable):
+        """Install modules in the virtual environment with a single pip call."""
         try:
-            subprocess.check_call([python_executable, '-m', 'pip', 'install', module_name], 
-                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            self.logger.debug(f"Módulo {module_name} instalado com sucesso")
+            subprocess.check_call([python_executable, '-m', 'pip', 'install',
+                                   '--disable-pip-version-check', '--no-input', '-q', *module_names],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.logger.debug(f"Módulos {', '.join(module_names)} instalados com sucesso")
         except subprocess.CalledProcessError as e:
-            self.logger.error(f"Erro ao instalar módulo {module_name}: {e}")
+            self.logger.error(f"Erro ao instalar módulos {', '.join(module_names)}: {e}")
             raise
 
+    def _extensao_arquivo(self):
+        """Retorna a extensão dos arquivos gerados conforme a compressão configurada."""
+        if self._backup_cfg.get('compression', 'gzip') == 'zstd':
+            return 'tar.zst'
+        return 'tar.gz'
+
     def show_backup_plan(self, folder_config):
         """Mostra o plano de backup para uma pasta específica."""
         name = folder_config['name']
@@ -178,8 +409,8 @@ class BackupManager:
         print(f"\n📁 {name}:")
         print(f"   📂 Caminho: {path}")
         print(f"   🎯 Split depth: {split_depth}")
-        print(f"   ☁️  Bucket S3: {self.config['s3']['bucket']}")
-        print(f"   🗄️  Storage class: {self.config['s3'].get('storage_class', 'DEEP_ARCHIVE')}")
+        print(f"   ☁️  Bucket S3: {self._s3['bucket']}")
+        print(f"   🗄️  Storage class: {self._s3.get('storage_class', 'DEEP_ARCHIVE')}")
         
         if not os.path.exists(path):
             print(f"   ❌ ERRO: Caminho não encontrado!")
@@ -190,7 +421,7 @@ class BackupManager:
             print(f"      → S3: {name}/{os.path.basename(path)}")
         elif split_depth == 0:
             print(f"   📦 Backup como arquivo único:")
-            print(f"      → S3: {name}/{os.path.basename(path)}.tar.gz")
+            print(f"      → S3: {name}/{os.path.basename(path)}.{self._extensao_arquivo()}")
         else:
             print(f"   📁 Estrutura que será processada:")
             self._show_directory_structure(path, split_depth, name, "", 1)
@@ -198,33 +429,35 @@ class BackupManager:
     def _show_directory_structure(self, base_path, target_depth, backup_name, current_path, current_depth):
         """Mostra recursivamente a estrutura de diretórios que será processada."""
         full_path = os.path.join(base_path, current_path) if current_path else base_path
+        indent = "      " + "  " * current_depth
         
         try:
-            entries = os.listdir(full_path)
-            dirs = [e for e in entries if os.path.isdir(os.path.join(full_path, e))]
-            files = [e for e in entries if os.path.isfile(os.path.join(full_path, e))]
+            # Tipo de cada entrada vem do próprio DirEntry, sem isdir/isfile extras
+            with os.scandir(full_path) as it:
+                entries = list(it)
+            # Diretórios do sistema já são filtrados na mesma passagem
+            dirs = [e.name for e in entries
+                    if e.name not in _SKIP_DIRS and e.is_dir(follow_symlinks=False)]
+            files = [e.name for e in entries if e.is_file(follow_symlinks=False)]
             
-            # Filtrar diretórios do sistema
-            dirs = [d for d in dirs if d not in ['$RECYCLE.BIN', '.Trash-1000', 'System Volume Information']]
-            
-            indent = "      " + "  " * current_depth
+            ext = self._extensao_arquivo()
             
             # Se estamos na profundidade alvo, mostrar o que será feito
             if current_depth == target_depth:
                 # Arquivos no nível atual (somente se houver arquivos)
                 if files:
-                    s3_path = f"{backup_name}/{current_path}/_files.tar.gz" if current_path else f"{backup_name}/_files.tar.gz"
+                    s3_path = f"{backup_name}/{current_path}/_files.{ext}" if current_path else f"{backup_name}/_files.{ext}"
                     print(f"{indent}📄 Arquivos ({len(files)} arquivos) → {s3_path}")
                 
                 # Cada diretório como arquivo separado
                 for dir_name in sorted(dirs):
                     dir_path = os.path.join(current_path, dir_name) if current_path else dir_name
-                    s3_path = f"{backup_name}/{dir_path}.tar.gz"
+                    s3_path = f"{backup_name}/{dir_path}.{ext}"
                     
                     # Contar arquivos no diretório
                     dir_full_path = os.path.join(full_path, dir_name)
                     try:
-                        file_count = sum(len(files) for _, _, files in os.walk(dir_full_path))
+                        file_count = _contar_arquivos(dir_full_path)
                         print(f"{indent}📁 {dir_name}/ ({file_count} arquivos) → {s3_path}")
                     except (OSError, PermissionError):
                         print(f"{indent}📁 {dir_name}/ (erro ao contar) → {s3_path}")
@@ -234,70 +467,174 @@ class BackupManager:
                 # Mostrar arquivos no nível atual apenas se estivermos no último nível antes do target
                 if current_depth == target_depth - 1:
                     if files:
-                        s3_path = f"{backup_name}/{current_path}/_files.tar.gz" if current_path else f"{backup_name}/_files.tar.gz"
+                        s3_path = f"{backup_name}/{current_path}/_files.{ext}" if current_path else f"{backup_name}/_files.{ext}"
                         print(f"{indent}📄 Arquivos ({len(files)} arquivos) → {s3_path}")
                 
                 # Continuar descendo pelos diretórios
                 for dir_name in sorted(dirs):
                     next_path = os.path.join(current_path, dir_name) if current_path else dir_name
                     
-                    # Mostrar o nome do diretório
-                    if current_depth < target_depth:
-                        # Contar arquivos totais no diretório para mostrar no preview
-                        dir_full_path = os.path.join(full_path, dir_name)
+                    if current_depth == target_depth - 1:
+                        # No último nível antes do target, mostrar que será arquivado;
+                        # a contagem só é necessária aqui
+                        s3_path = f"{backup_name}/{next_path}.{ext}"
                         try:
-                            file_count = sum(len(files) for _, _, files in os.walk(dir_full_path))
-                            if current_depth == target_depth - 1:
-                                # No último nível antes do target, mostrar que será arquivado
-                                s3_path = f"{backup_name}/{next_path}.tar.gz"
-                                print(f"{indent}📁 {dir_name}/ ({file_count} arquivos) → {s3_path}")
-                            else:
-                                # Níveis intermediários, apenas mostrar estrutura
-                                print(f"{indent}📁 {dir_name}/")
-                                self._show_directory_structure(base_path, target_depth, backup_name, next_path, current_depth + 1)
-                        except (OSError, PermissionError) as e:
+                            file_count = _contar_arquivos(os.path.join(full_path, dir_name))
+                            print(f"{indent}📁 {dir_name}/ ({file_count} arquivos) → {s3_path}")
+                        except (OSError, PermissionError):
                             print(f"{indent}📁 {dir_name}/ (erro ao acessar)")
+                    else:
+                        # Níveis intermediários, apenas mostrar estrutura
+                        print(f"{indent}📁 {dir_name}/")
+                        self._show_directory_structure(base_path, target_depth, backup_name, next_path, current_depth + 1)
                             
         except (OSError, PermissionError) as e:
             print(f"{indent}❌ Erro ao acessar diretório: {e}")
 
-    def calculate_directory_hash(self, path):
-        """Calcula hash MD5 apenas dos arquivos do nível atual da pasta."""
-        hash_md5 = hashlib.md5()
-        
+    def _scan(self, path):
+        """Varre a pasta uma única vez por execução de backup, ordenando por caminho.
+
+        A lista de arquivos, o hash e a validação compartilham esse resultado.
+        """
+        entries = self._scan_cache.get(path)
+        if entries is None:
+            inicio_rel = len(os.path.join(path, ''))
+            entries = []
+            for entry in _iter_files(path):
+                try:
+                    stat = entry.stat()
+                    size, mtime_ns = stat.st_size, stat.st_mtime_ns
+                    is_file = entry.is_file()
+                except OSError:
+                    size, mtime_ns, is_file = None, None, False
+                entries.append(ScanEntry(entry.path[inicio_rel:], size, mtime_ns, entry.path, is_file))
+            entries.sort()
+            self._scan_cache[path] = entries
+        return entries
+
+    def _caminho_manifesto(self, name):
+        """Caminho do manifesto de hashes da pasta."""
+        return Path(__file__).parent / "logs" / f"manifest_{name}.json"
+
+    def carregar_manifesto(self, name):
+        """Carrega o manifesto da última execução.
+
+        Contém 'arquivos' (relpath -> [tamanho, mtime_ns, hash]) e 'hash', o
+        digest da pasta combinado a partir desses arquivos.
+        """
+        manifesto = {'arquivos': {}, 'hash': None}
+        try:
+            manifesto.update(_json_loads(self._caminho_manifesto(name).read_bytes()))
+        except (OSError, ValueError):
+            pass
+        return manifesto
+
+    def salvar_manifesto(self, name, manifesto):
+        """Grava o manifesto de forma atômica para uso na próxima execução."""
+        caminho = self._caminho_manifesto(name)
+        temporario = caminho.with_suffix('.json.tmp')
         try:
-            # Listar apenas arquivos do nível atual (não recursivo)
-            files = []
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isfile(item_path):
-                    files.append(item)
-            
-            # Ordenar para manter sempre a mesma ordem
-            files.sort()
-            
-            for filename in files:
-                filepath = os.path.join(path, filename)
+            with open(temporario, 'wb') as f:
+                f.write(_json_dumps(manifesto))
+            os.replace(temporario, caminho)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Erro ao salvar manifesto {caminho}: {e}")
+
+    def _hash_one(self, rel_path, filepath):
+        """Calcula o hash de um único arquivo (executado nas threads do pool)."""
+        with open(filepath, 'rb', buffering=0) as f:
+            return rel_path, _digest_arquivo(f)
+
+    def calculate_directory_hash(self, path, manifesto=None):
+        """Calcula hash BLAKE2b apenas dos arquivos do nível atual da pasta.
+
+        Cada arquivo é processado em paralelo por um pool de threads e os
+        digests individuais são combinados, em ordem de nome, no hash final.
+        Se um manifesto for informado, arquivos com mesmo tamanho e mtime
+        reaproveitam o hash anterior sem serem lidos; se nenhum arquivo mudou,
+        o digest da pasta também é reaproveitado. O manifesto é atualizado
+        com o estado atual.
+        """
+        hash_total = _novo_hash()
+        anterior = manifesto.get('arquivos', {}) if manifesto else {}
+        
+        # Apenas arquivos regulares do nível atual (não recursivo), a partir da varredura em cache
+        files = [
+            entry for entry in self._scan(path)
+            if os.sep not in entry.relpath and entry.is_file
+        ]
+        
+        resultados = []
+        pendentes = []
+        for entry in files:
+            registro = anterior.get(entry.relpath)
+            if registro and registro[0] == entry.size and registro[1] == entry.mtime_ns:
+                resultados.append((entry.relpath, bytes.fromhex(registro[2])))
+            else:
+                pendentes.append(entry)
+        
+        if anterior:
+            self.logger.debug(f"Manifesto: {len(resultados)} arquivos sem alteração, {len(pendentes)} para calcular")
+        
+        # Mesmo conjunto de arquivos, todos inalterados: o digest da pasta não muda
+        if manifesto and manifesto.get('hash') and not pendentes and len(resultados) == len(anterior):
+            return manifesto['hash']
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS_HASH) as executor:
+            futuros = {
+                executor.submit(self._hash_one, entry.relpath, entry.abspath): entry.abspath
+                for entry in pendentes
+            }
+            for futuro in as_completed(futuros):
                 try:
-                    # Incluir o nome do arquivo no hash
-                    hash_md5.update(filename.encode('utf-8'))
-                    
-                    # Incluir o conteúdo do arquivo no hash
-                    with open(filepath, 'rb') as f:
-                        for chunk in iter(lambda: f.read(4096), b""):
-                            hash_md5.update(chunk)
+                    resultados.append(futuro.result())
                 except (IOError, OSError) as e:
-                    self.logger.warning(f"Erro ao ler arquivo {filepath}: {e}")
-                    continue
-                    
-        except (OSError, PermissionError) as e:
-            self.logger.warning(f"Erro ao acessar diretório {path}: {e}")
+                    self.logger.warning(f"Erro ao ler arquivo {futuros[futuro]}: {e}")
+        
+        # Ordenar para manter sempre a mesma ordem, incluindo nome e digest de cada arquivo
+        for filename, digest in sorted(resultados):
+            hash_total.update(filename.encode('utf-8'))
+            hash_total.update(digest)
+        
+        if manifesto is not None:
+            digests = dict(resultados)
+            manifesto['arquivos'] = {
+                entry.relpath: [entry.size, entry.mtime_ns, digests[entry.relpath].hex()]
+                for entry in files if entry.relpath in digests
+            }
+            manifesto['hash'] = hash_total.hexdigest()
+        
+        return hash_total.hexdigest()
+
+    @contextlib.contextmanager
+    def _abrir_tar(self, tar_file):
+        """Abre o arquivo tar em modo streaming, descompactado por um processo nativo.
+
+        pigz/gzip/zstd rodam em outro processo (outro núcleo), enquanto o tarfile
+        apenas interpreta o fluxo já descompactado.
+        """
+        if tar_file.endswith('.tar.zst'):
+            comando = ['zstd', '-d', '--long=27', '-T0', '-c', tar_file]
+        elif shutil.which('pigz'):
+            comando = ['pigz', '-dc', tar_file]
+        else:
+            comando = ['gzip', '-dc', tar_file]
+        
+        processo = subprocess.Popen(comando, stdout=subprocess.PIPE, bufsize=CHUNK_SIZE)
+        try:
+            with tarfile.open(fileobj=processo.stdout, mode="r|") as tar:
+                yield tar
+        finally:
+            processo.stdout.close()
+            codigo = processo.wait()
         
-        return hash_md5.hexdigest()
+        # SIGPIPE é esperado quando a leitura termina antes do fim do fluxo
+        if codigo not in (0, -signal.SIGPIPE):
+            raise tarfile.ReadError(f"{comando[0]} terminou com código {codigo}")
 
     def validar_backup_completo(self, tar_file, original_path):
         """Valida se o backup está íntegro comparando com a pasta original."""
-        if not self.config.get('validation', {}).get('deep_validation', True):
+        if not self._validation.get('deep_validation', True):
             return True
             
         self.logger.info(f"Validando backup {tar_file} contra {original_path}...")
@@ -307,57 +644,77 @@ class BackupManager:
             return False
         
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                with tarfile.open(tar_file, "r:gz") as tar:
-                    tar.extractall(temp_dir)
-                
-                # Compara estrutura de arquivos
-                original_files = set()
-                for root, dirs, files in os.walk(original_path):
-                    for file in files:
-                        rel_path = os.path.relpath(os.path.join(root, file), original_path)
-                        original_files.add(rel_path)
-                
-                extracted_files = set()
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        rel_path = os.path.relpath(os.path.join(root, file), temp_dir)
-                        extracted_files.add(rel_path)
-                
-                missing_files = original_files - extracted_files
-                extra_files = extracted_files - original_files
-                
-                if missing_files:
-                    self.logger.error(f"Arquivos faltando no backup: {missing_files}")
-                    return False
-                
-                if extra_files:
-                    self.logger.warning(f"Arquivos extras no backup: {extra_files}")
-                
-                # Validação de hash dos arquivos (amostragem para arquivos grandes)
-                files_to_check = list(original_files)
-                if len(files_to_check) > 100:  # Amostragem para muitos arquivos
-                    import random
-                    files_to_check = random.sample(files_to_check, 100)
+            # Compara estrutura de arquivos
+            scan = self._scan(original_path)
+            
+            # Validação de conteúdo dos arquivos (amostragem para arquivos grandes),
+            # definida antes de percorrer o tar para calcular os hashes durante a leitura
+            # Apenas arquivos regulares: abrir um FIFO bloquearia a thread indefinidamente
+            amostra = [entry for entry in scan if entry.is_file]
+            if len(amostra) > 100:  # Amostragem para muitos arquivos
+                amostra = random.sample(amostra, 100)
+            files_to_check = {entry.relpath: entry.size for entry in amostra}
+            
+            extracted_files = []
+            digests_extraidos = {}
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS_HASH) as executor:
+                # Os originais da amostra são lidos em paralelo, nas threads do pool,
+                # enquanto o tar é percorrido na thread atual
+                futuros = {
+                    rel_path: executor.submit(self._hash_one, rel_path, os.path.join(original_path, rel_path))
+                    for rel_path in files_to_check
+                }
                 
-                for rel_path in files_to_check:
-                    original_file = os.path.join(original_path, rel_path)
-                    extracted_file = os.path.join(temp_dir, rel_path)
-                    
-                    if not os.path.exists(extracted_file):
-                        self.logger.error(f"Arquivo {rel_path} não encontrado no backup extraído")
-                        return False
+                try:
+                    # Percorre o tar em modo streaming, sem extrair para disco
+                    with self._abrir_tar(tar_file) as tar:
+                        for member in tar:
+                            if not (member.isfile() or member.islnk()):
+                                continue
+                            
+                            rel_path = os.path.normpath(member.name)
+                            extracted_files.append(rel_path)
+                            
+                            if rel_path in files_to_check and member.isfile():
+                                # Tamanhos diferentes dispensam a leitura do conteúdo
+                                if member.size != files_to_check[rel_path]:
+                                    self.logger.error(f"Tamanho diferente para arquivo {rel_path}")
+                                    return False
+                                
+                                digest = _digest_arquivo(tar.extractfile(member))
+                                
+                                # Compara já se o original terminou, sem bloquear a leitura do tar
+                                futuro = futuros[rel_path]
+                                if not futuro.done():
+                                    digests_extraidos[rel_path] = digest
+                                elif futuro.result()[1] != digest:
+                                    self.logger.error(f"Hash diferente para arquivo {rel_path}")
+                                    return False
                     
-                    with open(original_file, 'rb') as f1, open(extracted_file, 'rb') as f2:
-                        hash1 = hashlib.md5(f1.read()).hexdigest()
-                        hash2 = hashlib.md5(f2.read()).hexdigest()
-                        
-                        if hash1 != hash2:
+                    for rel_path, digest in digests_extraidos.items():
+                        if futuros[rel_path].result()[1] != digest:
                             self.logger.error(f"Hash diferente para arquivo {rel_path}")
                             return False
-                
-                self.logger.info(f"Backup validado com sucesso: {len(original_files)} arquivos verificados")
-                return True
+                finally:
+                    # Na primeira divergência, descarta os hashes que ainda não começaram
+                    for futuro in futuros.values():
+                        futuro.cancel()
+            
+            # O tar é gerado em ordem, então a ordenação aqui é quase linear
+            extracted_files.sort()
+            missing_files, extra_files = _diff_ordenado(
+                (entry.relpath for entry in scan), extracted_files
+            )
+            
+            if missing_files:
+                self.logger.error(f"Arquivos faltando no backup: {missing_files}")
+                return False
+            
+            if extra_files:
+                self.logger.warning(f"Arquivos extras no backup: {extra_files}")
+            
+            self.logger.info(f"Backup validado com sucesso: {len(scan)} arquivos verificados")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Erro durante validação: {e}")
@@ -366,33 +723,38 @@ class BackupManager:
     def gerar_lista_arquivos(self, path, output_file):
         """Gera um arquivo TXT com a lista de todos os arquivos da pasta."""
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(f"Lista de arquivos de: {path}\n")
-                f.write(f"Gerado em: {datetime.now().isoformat()}\n")
-                f.write("-" * 50 + "\n\n")
+            entries = self._scan(path)
+            
+            with open(output_file, 'wb', buffering=1 << 20) as f:
+                cabecalho = (
+                    f"Lista de arquivos de: {path}\n"
+                    f"Gerado em: {datetime.now().isoformat()}\n"
+                    + "-" * 50 + "\n\n"
+                )
+                f.write(cabecalho.encode('utf-8'))
                 
-                total_files = 0
-                total_size = 0
+                # Linhas já codificadas, acumuladas em lotes para reduzir chamadas de escrita;
+                # os.fsencode preserva nomes que não são UTF-8 válido
+                lote = []
+                for entry in entries:
+                    if entry.size is None:
+                        lote.append(b'%s (erro ao obter tamanho)\n' % os.fsencode(entry.relpath))
+                    else:
+                        lote.append(b'%s (%d bytes)\n' % (os.fsencode(entry.relpath), entry.size))
+                    if len(lote) >= 10000:
+                        f.writelines(lote)
+                        lote.clear()
+                f.writelines(lote)
                 
-                for root, dirs, files in os.walk(path):
-                    dirs.sort()
-                    files.sort()
-                    
-                    for filename in files:
-                        filepath = os.path.join(root, filename)
-                        try:
-                            size = os.path.getsize(filepath)
-                            rel_path = os.path.relpath(filepath, path)
-                            f.write(f"{rel_path} ({size} bytes)\n")
-                            total_files += 1
-                            total_size += size
-                        except OSError:
-                            f.write(f"{rel_path} (erro ao obter tamanho)\n")
-                            total_files += 1
+                total_files = len(entries)
+                total_size = sum(entry.size for entry in entries if entry.size is not None)
                 
-                f.write(f"\n" + "-" * 50 + "\n")
-                f.write(f"Total de arquivos: {total_files}\n")
-                f.write(f"Tamanho total: {total_size} bytes ({total_size/(1024**3):.2f} GB)\n")
+                rodape = (
+                    "\n" + "-" * 50 + "\n"
+                    f"Total de arquivos: {total_files}\n"
+                    f"Tamanho total: {total_size} bytes ({total_size/(1024**3):.2f} GB)\n"
+                )
+                f.write(rodape.encode('utf-8'))
                 
             self.logger.info(f"Lista de arquivos gerada: {output_file}")
             return True
@@ -401,22 +763,94 @@ class BackupManager:
             self.logger.error(f"Erro ao gerar lista de arquivos: {e}")
             return False
 
-    async def enviar_mensagem(self, mensagem):
-        """Envia uma mensagem pelo Telegram."""
-        try:
-            import telegram
+    async def _obter_bot(self):
+        """Retorna o Bot do Telegram, criado e inicializado uma única vez por execução."""
+        if self._bot is None:
             from telegram import Bot
+            bot = Bot(token=self.config['telegram']['token'])
+            # Sem initialize(), Bot.shutdown() não fecha o cliente HTTP
+            await bot.initialize()
+            self._bot = bot
+        return self._bot
+
+    async def aclose(self):
+        """Encerra o Bot do Telegram, fechando as conexões HTTP reutilizadas."""
+        if self._bot is None:
+            return
+        try:
+            await self._bot.shutdown()
+        except Exception as e:
+            self.logger.debug(f"Erro ao encerrar bot do Telegram: {e}")
+        self._bot = None
 
-            token = self.config['telegram']['token']
+    async def _enviar_telegram(self, mensagem):
+        """Envia diretamente uma mensagem pelo Telegram."""
+        try:
             chat_id = self.config['telegram']['chat_id']
             
-            bot = Bot(token=token)
+            bot = await self._obter_bot()
             await bot.send_message(chat_id=chat_id, text=mensagem, parse_mode='HTML')
             self.logger.debug(f"Mensagem enviada: {mensagem[:50]}...")
             
         except Exception as e:
             self.logger.error(f"Erro ao enviar mensagem Telegram: {e}")
 
+    async def enviar_mensagem(self, mensagem):
+        """Envia uma mensagem pelo Telegram.
+
+        Enquanto os backups estão em execução a mensagem entra na fila e é
+        agrupada com as que chegarem logo em seguida.
+        """
+        if self._fila_mensagens is not None:
+            await self._fila_mensagens.put(mensagem)
+        else:
+            await self._enviar_telegram(mensagem)
+
+    @staticmethod
+    def _agrupar_mensagens(mensagens):
+        """Junta mensagens com quebra de linha respeitando o limite do Telegram."""
+        blocos = []
+        atual = ""
+        for mensagem in mensagens:
+            candidato = f"{atual}\n{mensagem}" if atual else mensagem
+            if atual and len(candidato) > TELEGRAM_MAX_CHARS:
+                blocos.append(atual)
+                atual = mensagem
+            else:
+                atual = candidato
+        if atual:
+            blocos.append(atual)
+        return blocos
+
+    async def _consumir_mensagens(self):
+        """Consome a fila enviando juntas as mensagens de uma mesma janela de tempo."""
+        fila = self._fila_mensagens
+        loop = asyncio.get_running_loop()
+        encerrar = False
+        
+        while not encerrar:
+            mensagem = await fila.get()
+            if mensagem is None:
+                break
+            
+            lote = [mensagem]
+            limite = loop.time() + JANELA_MENSAGENS
+            while True:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    mensagem = await asyncio.wait_for(fila.get(), timeout=restante)
+                except asyncio.TimeoutError:
+                    break
+                if mensagem is None:
+                    encerrar = True
+                    break
+                lote.append(mensagem)
+            
+            for bloco in self._agrupar_mensagens(lote):
+                await self._enviar_telegram(bloco)
+
     async def executar_backup(self, folder_config, dry_run=False):
         """Executa o script de backup com validação completa."""
         name = folder_config['name']
@@ -424,8 +858,8 @@ class BackupManager:
         split_depth = folder_config['split_depth']
         
         try:
-            temp_dir = self.config['backup']['temp_dir']
-            tar_path = f"{temp_dir}/{name}.tar.gz"
+            temp_dir = self._backup_cfg['temp_dir']
+            tar_path = f"{temp_dir}/{name}.{self._extensao_arquivo()}"
             txt_path = f"{temp_dir}/{name}_files.txt"
             
             self.logger.info(f"Iniciando backup para {name} (split-depth: {split_depth})")
@@ -439,32 +873,47 @@ class BackupManager:
                 self.logger.info(f"🔍 DRY RUN: Backup seria executado para {name}")
                 return True
             
+            # Etapas de disco rodam em threads para não bloquear o event loop
+            loop = asyncio.get_running_loop()
+            
             # Gera lista de arquivos antes do backup
-            if not self.gerar_lista_arquivos(path, txt_path):
+            if not await loop.run_in_executor(None, self.gerar_lista_arquivos, path, txt_path):
                 await self.enviar_mensagem(f"❌ Falha ao gerar lista de arquivos para <b>{name}</b>")
                 return False
             
-            # Calcula hash da pasta original
-            if self.config.get('validation', {}).get('enabled', True):
+            # Calcula hash da pasta original, reaproveitando o manifesto da execução anterior
+            manifesto = None
+            if self._validation.get('enabled', True):
                 self.logger.info(f"Calculando hash original para {name}...")
-                original_hash = self.calculate_directory_hash(path)
+                manifesto = self.carregar_manifesto(name)
+                original_hash = await loop.run_in_executor(
+                    None, self.calculate_directory_hash, path, manifesto
+                )
                 self.logger.info(f"Hash original da pasta {name}: {original_hash}")
             
             # Prepara comando de backup
             comando = [
-                self.config['backup']['script_path'],
-                "--bucket", self.config['s3']['bucket'],
+                self._backup_cfg['script_path'],
+                "--bucket", self._s3['bucket'],
                 "--name", name,
                 "--path", path,
                 "--split-depth", str(split_depth),
-                "--storage-class", self.config['s3'].get('storage_class', 'DEEP_ARCHIVE')
+                "--storage-class", self._s3.get('storage_class', 'DEEP_ARCHIVE')
             ]
             
-            if self.config.get('validation', {}).get('enabled', True):
+            if self._validation.get('enabled', True):
                 comando.append("--validate")
                 
-            if self.config.get('validation', {}).get('keep_local_copy', False):
+            if self._validation.get('keep_local_copy', False):
                 comando.append("--keep-local")
+            
+            compression = self._backup_cfg.get('compression', 'gzip')
+            if compression != 'gzip':
+                comando.extend(["--compression", compression])
+            
+            parallel_uploads = self._s3.get('parallel_uploads', 1)
+            if parallel_uploads > 1:
+                comando.extend(["--parallel-uploads", str(parallel_uploads)])
 
             self.logger.info(f"Executando comando: {' '.join(comando)}")
             
@@ -472,30 +921,36 @@ class BackupManager:
             print(f"🚀 Executando: {' '.join(comando)}")
             print("=" * 60)
 
-            processo = subprocess.Popen(
-                comando,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+            # Subprocesso assíncrono: o event loop continua livre para outras pastas.
+            # A saída é lida em blocos de até 1 MiB
+            # Sessão própria permite encerrar o script junto com seus filhos (tar, rclone)
+            processo = await asyncio.create_subprocess_exec(
+                *comando,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=CHUNK_SIZE,
+                start_new_session=True
             )
 
             # Captura e exibe saída em tempo real
             output_lines = []
-            while True:
-                output = processo.stdout.readline()
-                if output == '' and processo.poll() is not None:
-                    break
-                if output:
+
+            try:
+                async for output in _linhas_saida(processo.stdout):
                     # Remove quebras de linha extras e exibe
-                    line = output.strip()
-                    print(f"📤 {line}")
+                    line = output.decode('utf-8', errors='replace').strip()
+                    print(f"📤 [{name}] {line}")
                     output_lines.append(line)
                     # Flush para garantir saída imediata
                     sys.stdout.flush()
+                resultado_codigo = await processo.wait()
+            except BaseException:
+                # Erro de leitura ou cancelamento: o upload não pode continuar sozinho
+                with contextlib.suppress(ProcessLookupError):
+                    os.killpg(processo.pid, signal.SIGKILL)
+                await processo.wait()
+                raise
 
-            resultado_codigo = processo.poll()
             resultado_stdout = '\n'.join(output_lines)
 
             print("=" * 60)
@@ -514,9 +969,12 @@ class BackupManager:
             self.logger.info(f"Backup executado com sucesso para {name}")
             self.logger.debug(f"Saída do comando: {resultado.stdout}")
             
+            if manifesto is not None:
+                self.salvar_manifesto(name, manifesto)
+            
             # Validação local se arquivo existe
-            if os.path.exists(tar_path) and self.config.get('validation', {}).get('deep_validation', True):
-                if self.validar_backup_completo(tar_path, path):
+            if os.path.exists(tar_path) and self._validation.get('deep_validation', True):
+                if await loop.run_in_executor(None, self.validar_backup_completo, tar_path, path):
                     await self.enviar_mensagem(f"✅ Backup e validação completos para <b>{name}</b>")
                     return True
                 else:
@@ -552,6 +1010,29 @@ class BackupManager:
             if not dry_run:
                 await self.enviar_mensagem(mensagem_erro)
             return False
+        
+        finally:
+            # A varredura vale apenas para esta execução
+            self._scan_cache.pop(path, None)
+
+    async def _backup_com_notificacao(self, folder_config, semaforo, notificar_inicio=True):
+        """Executa o backup de uma pasta notificando início e resultado."""
+        name = folder_config['name']
+        
+        async with semaforo:
+            if notificar_inicio:
+                await self.enviar_mensagem(
+                    f"🔄 Iniciando backup para <b>{name}</b> (split-depth: {folder_config['split_depth']})"
+                )
+            
+            sucesso = await self.executar_backup(folder_config)
+            
+            if sucesso:
+                await self.enviar_mensagem(f"✅ Backup para <b>{name}</b> concluído com sucesso!")
+            else:
+                await self.enviar_mensagem(f"❌ Falha no backup para <b>{name}</b>")
+            
+            return sucesso
 
     async def executar_todos_backups(self, dry_run=False):
         """Executa todos os backups configurados."""
@@ -568,8 +1049,8 @@ class BackupManager:
             print(f"\n📊 Resumo:")
             print(f"   📂 Total de pastas configuradas: {len(self.config['folders'])}")
             print(f"   ✅ Pastas habilitadas: {len(folders_habilitadas)}")
-            print(f"   ☁️  Bucket S3: {self.config['s3']['bucket']}")
-            print(f"   🗄️  Storage class: {self.config['s3'].get('storage_class', 'DEEP_ARCHIVE')}")
+            print(f"   ☁️  Bucket S3: {self._s3['bucket']}")
+            print(f"   🗄️  Storage class: {self._s3.get('storage_class', 'DEEP_ARCHIVE')}")
             
             if not folders_habilitadas:
                 print("\n❌ Nenhuma pasta habilitada para backup!")
@@ -583,28 +1064,49 @@ class BackupManager:
             print("="*60)
             return True
         
+        # O bot do Telegram é encerrado mesmo se a execução falhar
+        try:
+            return await self._executar_backups(inicio)
+        finally:
+            await self.aclose()
+
+    async def _executar_backups(self, inicio):
+        """Executa os backups das pastas habilitadas e envia o relatório final."""
         self.logger.info("🚀 Iniciando processo de backup automatizado")
         await self.enviar_mensagem("🚀 <b>Iniciando backup automatizado</b>")
         
         folders_habilitadas = [f for f in self.config['folders'] if f.get('enabled', True)]
+        
+        # Executa as pastas em paralelo, limitado para não saturar o disco de origem
+        parallel_folders = self._backup_cfg.get('parallel_folders', 1)
+        semaforo = asyncio.Semaphore(parallel_folders)
+        
+        # Em paralelo os avisos de início chegam fora de ordem: apenas o resultado é enviado
+        notificar_inicio = parallel_folders <= 1
+        
+        # Notificações das pastas são agrupadas por um consumidor em segundo plano
+        self._fila_mensagens = asyncio.Queue()
+        consumidor = asyncio.create_task(self._consumir_mensagens())
+        try:
+            resultados = await asyncio.gather(
+                *[self._backup_com_notificacao(f, semaforo, notificar_inicio) for f in folders_habilitadas],
+                return_exceptions=True
+            )
+        finally:
+            await self._fila_mensagens.put(None)
+            await consumidor
+            self._fila_mensagens = None
+        
         sucessos = 0
         falhas = 0
-
-        for folder_config in folders_habilitadas:
-            name = folder_config['name']
-            
-            await self.enviar_mensagem(
-                f"🔄 Iniciando backup para <b>{name}</b> (split-depth: {folder_config['split_depth']})"
-            )
-            
-            sucesso = await self.executar_backup(folder_config)
-            
-            if sucesso:
+        for folder_config, resultado in zip(folders_habilitadas, resultados):
+            if isinstance(resultado, Exception):
+                self.logger.error(f"Erro inesperado no backup para {folder_config['name']}: {resultado}")
+                falhas += 1
+            elif resultado:
                 sucessos += 1
-                await self.enviar_mensagem(f"✅ Backup para <b>{name}</b> concluído com sucesso!")
             else:
                 falhas += 1
-                await self.enviar_mensagem(f"❌ Falha no backup para <b>{name}</b>")
         
         # Relatório final
         fim = datetime.now()
@@ -628,6 +1130,17 @@ class BackupManager:
         script_dir = Path(__file__).parent
         venv_dir = script_dir / 'venv'
         
+        # Módulos necessários (nome no pip -> nome de importação)
+        required_modules = {'python-telegram-bot': 'telegram'}
+        
+        # Já executando com o Python do ambiente virtual (após o execv), ou o
+        # interpretador atual já tem as dependências: nada a fazer
+        if Path(sys.prefix).resolve() == venv_dir.resolve():
+            return
+        if all(importlib.util.find_spec(nome) for nome in required_modules.values()):
+            self.logger.debug('Dependências disponíveis no interpretador atual')
+            return
+        
         # Cria ambiente virtual
         self.create_virtualenv(venv_dir)
         
@@ -637,15 +1150,24 @@ class BackupManager:
         else:  # Unix/Linux
             python_executable = venv_dir / 'bin' / 'python'
         
-        # Instala módulos necessários
-        required_modules = ['python-telegram-bot']
-        for module in required_modules:
-            self.install_module(module, str(python_executable))
+        # Instala módulos necessários apenas na primeira execução ou quando a
+        # lista de dependências mudar (registrada no arquivo sentinela)
+        sentinela = venv_dir / '.deps_installed'
+        dependencias = '\n'.join(sorted(required_modules))
+        try:
+            instaladas = sentinela.read_text(encoding='utf-8')
+        except OSError:
+            instaladas = None
+        if instaladas != dependencias:
+            if self.modules_installed(list(required_modules.values()), str(python_executable)):
+                self.logger.debug('Dependências já instaladas no ambiente virtual')
+            else:
+                self.install_modules(list(required_modules), str(python_executable))
+            sentinela.write_text(dependencias, encoding='utf-8')
         
-        # Re-executa com o Python do ambiente virtual se necessário
-        if sys.executable != str(python_executable):
-            self.logger.info(f'Re-executando script com {python_executable}...')
-            os.execv(str(python_executable), [str(python_executable)] + sys.argv)
+        # Re-executa com o Python do ambiente virtual
+        self.logger.info(f'Re-executando script com {python_executable}...')
+        os.execv(str(python_executable), [str(python_executable)] + sys.argv)
 
 def main():
     parser = argparse.ArgumentParser(description='Sistema de Backup Automatizado')
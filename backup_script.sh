@@ -13,7 +13,7 @@ $(basename "${BASH_SOURCE[0]}") [-h] [-v] -b BUCKET_NAME -n BACKUP_NAME -p BACKU
 
 Backup all files and directories from a specified location to an AWS S3 bucket.
 
-Directories will be archived as separate .tar.gz files.
+Directories will be archived as separate .tar.gz (or .tar.zst) files.
 The depth on which directories will be archived is controlled by the --split-depth parameter.
 
 ${bold}Available options:${normal}
@@ -24,6 +24,8 @@ ${bold}Available options:${normal}
 -n, --name string        Backup name, acts as a S3 path prefix
 -p, --path string        Path to the file or directory to backup
 --storage-class string   S3 storage class (default "DEEP_ARCHIVE")
+--compression string     Archive compression: gzip or zstd (default "gzip")
+--parallel-uploads int   Number of archives created and uploaded at the same time (default 1)
 --dry-run                Don't upload files
 --validate               Enable enhanced validation
 --keep-local             Keep local copy of tar files for validation
@@ -44,7 +46,7 @@ etc.
 ${bold}Validation:${normal}
 
 The script always generates:
-- .tar.gz archive files
+- .tar.gz archive files (.tar.zst with --compression zstd)
 - .md5 files with content hashes
 - .txt files with complete file listings
 
@@ -81,7 +83,7 @@ show_backup_plan() {
   if [[ $depth -eq $split_depth ]]; then
     # Mostrar arquivos do nível atual
     if [[ $files_count -gt 0 ]]; then
-      echo "${indent}📄 Arquivos ($files_count arquivos) → $backup_name/$current_path/_files.tar.gz"
+      echo "${indent}📄 Arquivos ($files_count arquivos) → $backup_name/$current_path/_files.$archive_ext"
     fi
     
     # Mostrar cada diretório como arquivo separado
@@ -90,7 +92,7 @@ show_backup_plan() {
         local dir_clean=$(echo "$dir" | sed 's|^\./||')
         local dir_files
         dir_files=$(find "$dir" -type f 2>/dev/null | wc -l)
-        echo "${indent}📁 $dir_clean/ ($dir_files arquivos) → $backup_name/$current_path/$dir_clean.tar.gz"
+        echo "${indent}📁 $dir_clean/ ($dir_files arquivos) → $backup_name/$current_path/$dir_clean.$archive_ext"
       fi
     done
   elif [[ $depth -lt $split_depth ]]; then
@@ -119,6 +121,24 @@ main() {
     pwd -P
   )/$(basename "$root_path") # convert to absolute path
 
+  # archive compression: gzip (default) or multi-threaded zstd
+  case "$compression" in
+  gzip)
+    archive_ext="tar.gz"
+    # pigz compresses gzip on all cores and produces the same format
+    if command -v pigz >/dev/null 2>&1; then
+      tar_compress_args=("-I" "pigz")
+    else
+      tar_compress_args=("-z")
+    fi
+    ;;
+  zstd)
+    archive_ext="tar.zst"
+    tar_compress_args=("-I" "zstd -T0 --long=27")
+    ;;
+  *) die "Unknown compression: $compression" ;;
+  esac
+
   # division by 10k gives integer (without fraction), round result up by adding 1
   chunk_size_mb=$((max_size_gb * 1024 / 10000 + 1))
 
@@ -149,6 +169,7 @@ main() {
     msg "☁️  S3 bucket: $bucket"
     msg "📦 Backup name: $backup_name"
     msg "🗄️  Storage class: $storage_class"
+    msg "🗜️  Compression: $compression"
     echo ""
     
     if [[ -f "$root_path" ]]; then
@@ -158,7 +179,7 @@ main() {
     elif [[ "$split_depth" -eq 0 ]]; then
       msg "📦 Single archive backup:"
       msg "   Path: $root_path"
-      msg "   → S3: $backup_name/$(basename "$root_path").tar.gz"
+      msg "   → S3: $backup_name/$(basename "$root_path").$archive_ext"
     else
       msg "📁 Directory structure that will be backed up:"
       show_backup_plan . 1
@@ -174,6 +195,7 @@ main() {
     backup_path "$root_path" "$(basename "$root_path")"
   else
     traverse_path . 1
+    wait_backups
   fi
   
   msg "🎉 Backup process completed successfully"
@@ -183,6 +205,8 @@ parse_params() {
   split_depth=1  
   max_size_gb=1024
   storage_class="DEEP_ARCHIVE"
+  compression="gzip"
+  parallel_uploads=1
   dry_run=false
   validate=false
   keep_local=false
@@ -215,6 +239,14 @@ parse_params() {
       storage_class="${2-}"
       shift
       ;;
+    --compression)
+      compression="${2-}"
+      shift
+      ;;
+    --parallel-uploads)
+      parallel_uploads="${2-}"
+      shift
+      ;;
     --dry-run) dry_run=true ;;
     --validate) validate=true ;;
     --keep-local) keep_local=true ;;
@@ -227,6 +259,7 @@ parse_params() {
   [[ -z "${bucket-}" ]] && die "Missing required parameter: bucket"
   [[ -z "${backup_name-}" ]] && die "Missing required parameter: name"
   [[ -z "${root_path-}" ]] && die "Missing required parameter: path"
+  [[ "$parallel_uploads" =~ ^[1-9][0-9]*$ ]] || die "Invalid --parallel-uploads: $parallel_uploads (must be an integer >= 1)"
 
   return 0
 }
@@ -310,14 +343,14 @@ validate_archive() {
   fi
   
   # Test archive integrity
-  if ! tar -tzf "$archive_path" >/dev/null 2>&1; then
+  if ! tar "${tar_compress_args[@]}" -tf "$archive_path" >/dev/null 2>&1; then
     msg "❌ Archive integrity check failed: $archive_path"
     return 1
   fi
   
   # Count files in archive
   local archive_count
-  archive_count=$(tar -tzf "$archive_path" | wc -l)
+  archive_count=$(tar "${tar_compress_args[@]}" -tf "$archive_path" | wc -l)
   
   if [[ "$archive_count" -ne "$expected_count" ]]; then
     msg "❌ File count mismatch: archive has $archive_count files, expected $expected_count"
@@ -357,8 +390,14 @@ backup_path() {
     local archive_name files hash s3_hash local_archive
 
     path=$(echo "$path" | sed -E 's#(/(\./)+)|(/\.$)#/#g' | sed 's|/$||')     # remove /./ and trailing /
-    archive_name=$(echo "$backup_name/$name.tar.gz" | sed -E 's|/(\./)+|/|g') # remove /./
-    local_archive="/tmp/$(basename "$archive_name")"
+    archive_name=$(echo "$backup_name/$name.$archive_ext" | sed -E 's|/(\./)+|/|g') # remove /./
+    if [[ "$split_depth" -eq 0 ]]; then
+      # single archive, no parallel jobs: keep the path the scheduler validates
+      local_archive="/tmp/$(basename "$archive_name")"
+    else
+      # full archive name keeps local files unique across parallel jobs (e.g. user1/_files vs user2/_files)
+      local_archive="/tmp/${archive_name//\//_}"
+    fi
 
     cd "$path" || die "Can't access $path"
 
@@ -427,7 +466,7 @@ backup_path() {
 
         # Create local archive first if validation is enabled or keep_local is true
         if [[ "$validate" == true ]] || [[ "$keep_local" == true ]]; then
-          echo "$tar_files" | tr '\n' '\0' | xargs -0 tar -zcf "$local_archive" --
+          echo "$tar_files" | tr '\n' '\0' | xargs -0 tar "${tar_compress_args[@]}" -cf "$local_archive" --
           
           # Validate local archive
           if [[ "$validate" == true ]]; then
@@ -454,7 +493,7 @@ backup_path() {
         else
           # Stream directly to S3 (original behavior)
           msg "⬆️ Streaming archive $archive_name to S3"
-          echo "$tar_files" | tr '\n' '\0' | xargs -0 tar -zcf - -- |
+          echo "$tar_files" | tr '\n' '\0' | xargs -0 tar "${tar_compress_args[@]}" -cf - -- |
             rclone rcat "${args[@]}" "AmazonS3:$bucket/$archive_name"
         fi
 
@@ -486,6 +525,51 @@ backup_path() {
   )
 }
 
+# Kills a process and all of its descendants (tar, rclone, ...)
+kill_tree() {
+  local child
+  for child in $(pgrep -P "$1" 2>/dev/null); do
+    kill_tree "$child"
+  done
+  kill "$1" 2>/dev/null || true
+}
+
+# Stops the archives still running in background and exits with the given status
+abort_backups() {
+  local status=$1
+  local pid
+  for pid in ${backup_pids[@]+"${backup_pids[@]}"}; do
+    kill_tree "$pid"
+  done
+  wait 2>/dev/null || true
+  die "❌ Backup job failed (exit $status), remaining jobs stopped" "$status"
+}
+
+# Runs backup_path in background, keeping at most $parallel_uploads archives
+# being created/uploaded at the same time. A failed job stops the other jobs
+# and aborts the script, as in the sequential flow.
+spawn_backup() {
+  local pid
+  if [[ ${#backup_pids[@]} -ge $parallel_uploads ]]; then
+    pid=${backup_pids[0]}
+    backup_pids=("${backup_pids[@]:1}")
+    wait "$pid" || abort_backups $?
+  fi
+
+  backup_path "$@" &
+  backup_pids+=("$!")
+}
+
+# Waits for all archives started by spawn_backup
+wait_backups() {
+  local pid
+  while [[ ${#backup_pids[@]} -gt 0 ]]; do
+    pid=${backup_pids[0]}
+    backup_pids=("${backup_pids[@]:1}")
+    wait "$pid" || abort_backups $?
+  done
+}
+
 # Arguments:
 # - path - the path relative to $root_path
 # - depth - the level from the $root_path
@@ -502,7 +586,7 @@ traverse_path() {
     files_count=$(find . -maxdepth 1 -type f 2>/dev/null | wc -l)
     
     if [[ $files_count -gt 0 ]]; then
-      backup_path "$root_path/$path" "$path/_files" true
+      spawn_backup "$root_path/$path" "$path/_files" true
     fi
   fi
 
@@ -520,7 +604,7 @@ traverse_path() {
         
         if [[ $depth -eq $split_depth ]]; then
           # At target depth: backup this directory as a single archive
-          backup_path "$root_path/$path/$dir" "$path/$dir_clean" false
+          spawn_backup "$root_path/$path/$dir" "$path/$dir_clean" false
         elif [[ $depth -lt $split_depth ]]; then
           # Above target depth: continue traversing
           local next_path
@@ -536,5 +620,7 @@ traverse_path() {
   fi
 }
 
+backup_pids=()
+
 parse_params "$@"
 main